@@ -0,0 +1,310 @@
+"""
+Checks for the VarianceStabilizedDropout sources shipped with the task.
+
+The graded TEST_SCRIPT only exercises the plain forward pass; these cover
+the rest of the layer (backward replay, dims, inplace/out, iter_chunks,
+fused_linear) for both the buggy starting point and the reference
+solution, which must behave identically apart from the scale.
+
+The torch checks only run when torch is installed and are reported as
+skipped otherwise.
+
+Run with pytest, or directly: python test_variance_dropout_task.py
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from variance_dropout_task import BUGGY_IMPLEMENTATION, CORRECT_SOLUTION
+
+
+def load_layers():
+    """Return the VarianceStabilizedDropout class from each shipped source."""
+    layers = []
+    for source in (BUGGY_IMPLEMENTATION, CORRECT_SOLUTION):
+        namespace = {}
+        exec(source, namespace)
+        layers.append(namespace["VarianceStabilizedDropout"])
+    return layers
+
+
+def test_backward_replays_forward_mask():
+    np.random.seed(42)
+    for layer in load_layers():
+        for shape in [(1000, 64), (7, 3), (5,)]:
+            x = np.random.randn(*shape)
+            dropout = layer(0.3, seed=0)
+            output = dropout(x)
+            grad = dropout.backward(np.ones_like(x))
+            assert np.array_equal(output == 0, grad == 0)
+            assert np.allclose(grad[grad != 0], dropout._scale)
+
+
+def test_backward_requires_forward():
+    np.random.seed(42)
+    for layer in load_layers():
+        try:
+            layer(0.3).backward(np.ones(4))
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("backward() without a forward call should raise")
+
+
+def test_scalar_inputs():
+    np.random.seed(42)
+    for layer in load_layers():
+        for x in (np.array(2.0), 2.0):
+            kept = set()
+            for seed in range(20):
+                dropout = layer(0.5, seed=seed)
+                output = dropout(x)
+                assert np.shape(output) == ()
+                assert output in (0.0, 2.0 * dropout._scale)
+                kept.add(float(output) != 0.0)
+                assert dropout.backward(np.array(1.0)) == (output != 0) * dropout._scale
+            assert kept == {True, False}
+        assert np.shape(layer(0.5, dtype=np.float32)(2.0)) == ()
+
+
+def test_backward_follows_forward_mode():
+    np.random.seed(42)
+    for layer in load_layers():
+        x = np.random.randn(50, 8)
+        grad = np.ones_like(x)
+
+        # Training forward, then eval(): the training mask still applies
+        dropout = layer(0.5, seed=5)
+        output = dropout(x)
+        dropout.eval()
+        assert np.array_equal(dropout.backward(grad) == 0, output == 0)
+
+        # Eval forward after a training one, then train(): identity
+        dropout = layer(0.5, seed=5)
+        dropout(x)
+        dropout.eval()
+        dropout(x)
+        dropout.train()
+        assert np.array_equal(dropout.backward(grad), grad)
+
+        # Eval forward with no earlier training call
+        dropout = layer(0.5)
+        dropout.eval()
+        dropout(x)
+        assert np.array_equal(dropout.backward(grad), grad)
+
+
+def test_backward_rejects_mismatched_grad_shape():
+    np.random.seed(42)
+    for layer in load_layers():
+        dropout = layer(0.3)
+        dropout(np.ones((10, 4)))
+        try:
+            dropout.backward(np.ones((5, 4)))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("backward() with a differently shaped grad should raise")
+
+
+def test_dtype_casts_input():
+    np.random.seed(42)
+    for layer in load_layers():
+        x = np.random.randn(200, 8)
+        dropout = layer(0.3, seed=7, dtype=np.float32)
+        output = dropout(x)
+        assert output.dtype == np.float32
+        expected = layer(0.3, seed=7)(x.astype(np.float32))
+        assert expected.dtype == np.float32
+        assert np.array_equal(output, expected)
+
+        grad = dropout.backward(np.ones_like(output))
+        assert grad.dtype == np.float32
+        assert np.array_equal(grad == 0, output == 0)
+
+        chunks = layer(0.3, seed=7, dtype=np.float32).iter_chunks(x, 50)
+        assert all(c.dtype == np.float32 for c in chunks)
+        assert layer(0.3, dtype=np.float32).fused_linear(
+            x, np.ones((8, 2)), np.zeros(2)).dtype == np.float32
+
+
+def test_inplace_and_out_match_default():
+    np.random.seed(42)
+    for layer in load_layers():
+        x = np.random.randn(300, 16)
+        expected = layer(0.3, seed=1)(x)
+
+        buf = np.empty_like(x)
+        assert layer(0.3, seed=1)(x, out=buf) is buf
+        assert np.array_equal(buf, expected)
+
+        x_copy = x.copy()
+        assert layer(0.3, seed=1)(x_copy, inplace=True) is x_copy
+        assert np.array_equal(x_copy, expected)
+
+        # Integer input cannot hold the result, so a float copy is returned
+        ints = np.ones((30, 4), dtype=np.int64)
+        output = layer(0.3)(ints, inplace=True)
+        assert output is not ints and output.dtype == np.float64
+        assert (ints == 1).all()
+
+
+def test_dims_broadcasts_one_mask():
+    np.random.seed(42)
+    for layer in load_layers():
+        x = np.ones((500, 32))
+        for dims, axis in [(0, 0), (-1, 1)]:
+            dropped = layer(0.5, seed=2, dims=dims)(x) == 0
+            # Every slice along the shared axis sees the same mask
+            assert np.array_equal(dropped.all(axis=axis), dropped.any(axis=axis))
+
+
+def test_dims_out_of_range_raises():
+    np.random.seed(42)
+    for layer in load_layers():
+        for dims in (2, 5, -3):
+            try:
+                layer(0.3, dims=dims)(np.ones((10, 4)))
+            except np.exceptions.AxisError:
+                pass
+            else:
+                raise AssertionError(f"dims={dims} should raise AxisError")
+
+
+def test_iter_chunks_masks_and_backward():
+    np.random.seed(42)
+    for layer in load_layers():
+        for dims in (None, 0, 1):
+            x = np.random.randn(2500, 17)
+            dropout = layer(0.4, seed=3, dims=dims)
+            output = np.concatenate([c.copy() for c in dropout.iter_chunks(x, 1000)])
+            assert output.shape == x.shape
+            if dims == 0:
+                # One feature mask shared by every chunk
+                assert (output[:, 0] == 0).all() or (output[:, 0] != 0).all()
+                assert np.array_equal((output == 0).all(0), (output == 0).any(0))
+            grad = dropout.backward(np.ones_like(x))
+            assert np.array_equal(output == 0, grad == 0)
+
+
+def test_iter_chunks_unaffected_by_interleaved_calls():
+    np.random.seed(42)
+    for layer in load_layers():
+        for dims in (None, 0):
+            x = np.random.randn(95, 6)
+            dropout = layer(0.5, seed=6, dims=dims)
+            chunks = dropout.iter_chunks(x, 10)
+            dropout(np.ones(3))
+            output = np.concatenate([c.copy() for c in chunks])
+            # The interleaved call must not reuse the pass's random words
+            after = dropout(np.ones((95, 6)))
+            assert not np.array_equal(after == 0, output == 0)
+
+            reference = layer(0.5, seed=6, dims=dims)
+            expected = np.concatenate([c.copy() for c in reference.iter_chunks(x, 10)])
+            assert np.array_equal(output, expected)
+            assert np.array_equal(reference.backward(np.ones_like(x)) == 0, output == 0)
+
+
+def test_iter_chunks_rejects_bad_chunk_rows():
+    np.random.seed(42)
+    for layer in load_layers():
+        try:
+            layer(0.3).iter_chunks(np.ones((10, 4)), 0)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("chunk_rows=0 should raise ValueError")
+
+
+def test_fused_linear_shapes():
+    np.random.seed(42)
+    for layer in load_layers():
+        W = np.random.randn(8, 5)
+        b = np.random.randn(5)
+        for shape in [(8,), (10, 8), (3, 4, 8)]:
+            x = np.random.randn(*shape)
+            output = layer(0.0).fused_linear(x, W, b)
+            assert output.shape == shape[:-1] + (5,)
+            assert np.allclose(output, x @ W + b)
+
+        x = np.random.randn(10, 8)
+        dropout = layer(0.5, seed=4)
+        output = dropout.fused_linear(x, W, b)
+        grad = dropout.backward(np.ones_like(output))
+        assert np.array_equal(output == 0, grad == 0)
+
+
+def test_torch_tensors():
+    if torch is None:
+        raise unittest.SkipTest("torch not installed")
+    np.random.seed(42)
+    torch.manual_seed(42)
+
+    for layer in load_layers():
+        x = torch.randn(2000, 64)
+        dropout = layer(0.3)
+        output = dropout(x)
+        assert isinstance(output, torch.Tensor)
+        assert output.shape == x.shape
+        kept = output != 0
+        assert abs(kept.float().mean().item() - 0.7) < 0.05
+        assert torch.allclose(output[kept], x[kept] * dropout._scale)
+
+        dropped = layer(0.5, dims=0)(torch.ones(100, 16)) == 0
+        assert torch.equal(dropped.all(0), dropped.any(0))
+
+        buf = torch.empty_like(x)
+        assert layer(0.3)(x, out=buf) is buf
+        x_copy = x.clone()
+        assert layer(0.3)(x_copy, inplace=True) is x_copy
+
+        ints = torch.ones(30, 4, dtype=torch.int64)
+        output = layer(0.3)(ints, inplace=True)
+        assert output.is_floating_point() and output is not ints
+        assert (ints == 1).all()
+
+        # Gradients flow through autograd on the torch path
+        leaf = torch.randn(50, 4, requires_grad=True)
+        layer(0.3)(leaf).sum().backward()
+        assert torch.equal(leaf.grad != 0, leaf.grad == leaf.grad.max())
+
+        # The mask came from torch, so there is nothing to replay
+        try:
+            dropout.backward(np.ones((2000, 64)))
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("backward() after a tensor forward should raise")
+
+        try:
+            dropout.iter_chunks(x)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("iter_chunks() should reject tensors")
+
+
+if __name__ == "__main__":
+    tests = [value for name, value in sorted(globals().items())
+             if name.startswith("test_") and callable(value)]
+    skipped = 0
+    for test in tests:
+        try:
+            test()
+        except unittest.SkipTest as exc:
+            skipped += 1
+            print(f"SKIPPED - {test.__name__} ({exc})")
+        else:
+            print(f"PASSED - {test.__name__}")
+    print(f"\n{len(tests) - skipped} checks passed, {skipped} skipped")
@@ -75,7 +75,9 @@ Debug and fix the implementation. Good luck!
 """
 
 
-BUGGY_IMPLEMENTATION = '''import numpy as np
+BUGGY_IMPLEMENTATION = '''import sys
+
+import numpy as np
 
 
 class VarianceStabilizedDropout:
@@ -86,36 +88,298 @@ class VarianceStabilizedDropout:
     mean but not variance. You need to fix the scaling factor.
     """
     
-    def __init__(self, dropout_rate=0.5):
+    # Elements per block when drawing the mask; keeps the mask and raw
+    # random words cache-resident instead of allocating them for all of x
+    _BLOCK_SIZE = 32768
+    
+    # Recorded in place of a generator snapshot when the last forward call
+    # ran in eval mode, so backward() knows it was the identity
+    _IDENTITY = object()
+    
+    def __init__(self, dropout_rate=0.5, dtype=None, seed=None, dims=None):
         """
         Args:
             dropout_rate: Probability of dropping a unit (0 to 1)
+            dtype: Float dtype to compute in (e.g. np.float32 to halve
+                memory traffic); None keeps the input dtype
+            seed: Seed for the mask generator; None draws one from the
+                global NumPy state so np.random.seed() stays reproducible
+            dims: Axis or axes along which one mask is shared (e.g. 0 drops
+                whole features for every sample); None masks each element
         """
         self.dropout_rate = dropout_rate
+        self.dtype = dtype
+        self.dims = (dims,) if np.isscalar(dims) else dims
         self.training = True
+        self._last_state = None
+        self._last_shape = None
+        self._last_chunk_rows = None
+        
+        if seed is None:
+            seed = np.random.randint(2**32, dtype=np.uint32)
+        # Counter-based Philox: a mask can be replayed from a state snapshot
+        self._bitgen = np.random.Philox(seed)
+        
+        # dropout_rate is fixed at construction, so derive these once
+        self._keep_prob = 1.0 - dropout_rate
+        # Keep a unit when a raw uint32 draw falls below this threshold
+        self._threshold = int(self._keep_prob * 2**32)
+        # (float() so the scale does not promote float32 inputs to float64)
+        # BUG: Using standard dropout scaling
+        # This preserves mean but NOT variance!
+        self._scale = float(1.0 / self._keep_prob)
     
-    def __call__(self, x):
+    def __call__(self, x, inplace=False, out=None):
         """
         Apply dropout to input array.
         
         Args:
             x: Input array of shape (batch_size, features)
+            inplace: If True, write the result into x instead of a new array
+                (x is only modified if it already has the compute dtype)
+            out: Optional preallocated array of x's shape to write into;
+                reusing one buffer across same-shape calls avoids a fresh
+                allocation per call
             
         Returns:
             Output array with dropout applied (training) or unchanged (eval)
         """
+        # A plain flag check is cheaper than dispatching to a callable
+        # swapped in by eval(), and honours direct writes to .training
         if not self.training:
+            self._last_state = self._IDENTITY
+            self._last_shape = np.shape(x)
             return x
         
-        # Generate dropout mask
-        keep_prob = 1.0 - self.dropout_rate
-        mask = np.random.binomial(1, keep_prob, size=x.shape)
+        # Torch tensors use torch's own (multi-threaded) Bernoulli kernel;
+        # torch is never imported here, only recognised if already loaded
+        torch = sys.modules.get("torch")
+        if torch is not None and isinstance(x, torch.Tensor):
+            return self._torch_dropout(torch, x, inplace, out)
         
-        # BUG: Using standard dropout scaling
-        # This preserves mean but NOT variance!
-        scale = 1.0 / keep_prob
+        if self.dtype is not None:
+            x = np.asarray(x, dtype=self.dtype)
+        
+        dtype = np.result_type(x, self._scale)
+        if inplace and isinstance(x, np.ndarray) and x.dtype == dtype:
+            out = x
+        elif out is None:
+            # Also taken for inplace=True when x cannot hold the scaled
+            # result (e.g. integer input), as documented above
+            out = np.empty_like(x, dtype=dtype)
+        
+        # Remember only the generator state needed to regenerate the
+        # mask in backward()
+        self._last_state = self._bitgen.state
+        self._last_shape = np.shape(x)
+        self._last_chunk_rows = None
+        return self._apply(x, out, self._bitgen)
+    
+    def iter_chunks(self, x, chunk_rows=1024):
+        """
+        Apply dropout to x in chunks of rows, yielding each result.
+        
+        Only one chunk-sized output buffer is allocated, so a consumer can
+        run the next op on each chunk while it is still in cache instead
+        of materialising the full output. A mask shared along axis 0 (see
+        dims) is drawn once and applied to every chunk.
+        
+        backward() afterwards takes the gradient for all of x and replays
+        the same chunk partition; if iteration stops early, only the rows
+        of chunks actually yielded match the forward masks. The pass draws
+        from its own generator, so other forward calls made while the
+        iterator is live do not change its masks.
         
-        return x * mask * scale
+        Args:
+            x: Input array of shape (batch_size, features)
+            chunk_rows: Number of rows per chunk
+            
+        Returns:
+            Iterator over the dropout output for each chunk of rows. The
+            buffer is reused, so a chunk is only valid until the next one
+            is requested.
+        """
+        torch = sys.modules.get("torch")
+        if torch is not None and isinstance(x, torch.Tensor):
+            raise TypeError("iter_chunks() supports NumPy arrays only")
+        if chunk_rows < 1:
+            raise ValueError(f"chunk_rows must be at least 1, got {chunk_rows}")
+        if np.ndim(x) == 0:
+            raise ValueError("iter_chunks() needs an array with at least one axis")
+        
+        if not self.training:
+            self._last_state = self._IDENTITY
+            self._last_shape = x.shape
+            return (x[start:start + chunk_rows]
+                    for start in range(0, len(x), chunk_rows))
+        
+        dtype = x.dtype if self.dtype is None else self.dtype
+        buf = np.empty((min(chunk_rows, len(x)),) + x.shape[1:],
+                       dtype=np.result_type(dtype, self._scale))
+        
+        # One snapshot for the whole pass, taken before any chunk is drawn
+        self._last_state = self._bitgen.state
+        self._last_shape = x.shape
+        self._last_chunk_rows = chunk_rows
+        
+        # Chunks are drawn lazily, so the pass gets a private generator and
+        # the shared one skips every word it could use: each 4-word Philox
+        # block covers at least 8 elements, plus one per block of rows
+        bitgen = np.random.Philox()
+        bitgen.state = self._last_state
+        self._bitgen.advance(x.size // 8 + len(x) + 1)
+        return self._apply_chunks(x, buf, bitgen, chunk_rows)
+    
+    def fused_linear(self, x, W, b):
+        """
+        Compute dropout(x @ W + b) without intermediate arrays.
+        
+        The matmul writes into one preallocated buffer, the bias is added
+        in place and dropout is then applied in place on that buffer, so
+        the linear output is never copied.
+        
+        Args:
+            x: Input array of shape (..., in_features)
+            W: Weight array of shape (in_features, out_features)
+            b: Bias array of shape (out_features,)
+            
+        Returns:
+            Output array of shape (..., out_features)
+        """
+        dtype = self.dtype
+        if dtype is None:
+            dtype = np.result_type(x, W, b, self._scale)
+        y = np.empty(x.shape[:-1] + W.shape[1:], dtype=dtype)
+        np.matmul(x, W, out=y)
+        y += b
+        return self(y, inplace=True)
+    
+    def backward(self, grad):
+        """
+        Propagate a gradient through the last forward call.
+        
+        Follows the mode that call ran in, not the current one: after an
+        eval-mode forward the gradient passes through unchanged.
+        
+        Args:
+            grad: Gradient w.r.t. the output of the last forward call
+            
+        Returns:
+            Gradient w.r.t. the input of that call
+        """
+        if self._last_state is None:
+            raise RuntimeError(
+                "backward() requires a preceding forward call on a NumPy array"
+            )
+        if np.shape(grad) != self._last_shape:
+            raise ValueError(
+                f"grad has shape {np.shape(grad)}, but the last forward call "
+                f"had shape {self._last_shape}"
+            )
+        if self._last_state is self._IDENTITY:
+            return grad
+        
+        # Replay the forward mask bit-for-bit from the saved state
+        bitgen = np.random.Philox()
+        bitgen.state = self._last_state
+        out = np.empty_like(grad, dtype=np.result_type(grad, self._scale))
+        if self._last_chunk_rows is None:
+            return self._apply(grad, out, bitgen)
+        
+        # Forward went through iter_chunks(): replay its chunk partition
+        for _ in self._apply_chunks(grad, out, bitgen, self._last_chunk_rows):
+            pass
+        return out
+    
+    def _apply(self, x, out, bitgen):
+        """Write dropout of x into out, drawing the mask block by block."""
+        if self.dims is not None:
+            # Draw one small mask and broadcast it, so RNG cost scales with
+            # the unshared axes only
+            shape = self._shared_shape(x.shape)
+            mask = self._mask(bitgen, shape, int(np.prod(shape)))
+            return np.multiply(x, mask * self._scale, out=out)
+        
+        if np.ndim(x) == 0:
+            # A scalar is a single block with no rows to split
+            np.multiply(x, self._mask(bitgen, (), 1), out=out)
+            out *= self._scale
+            return out
+        
+        # Bind per-call constants to locals once; the block loop then
+        # avoids repeated attribute and method lookups
+        draw_mask, scale, multiply = self._mask, self._scale, np.multiply
+        rows = max(1, self._BLOCK_SIZE * len(x) // max(1, x.size))
+        for start in range(0, len(x), rows):
+            block = out[start:start + rows]
+            mask = draw_mask(bitgen, block.shape, block.size)
+            # Mask then scale in place: two vectorised ufunc passes over a
+            # cache-resident block, which beats np.where's element-wise select
+            multiply(x[start:start + rows], mask, out=block)
+            block *= scale
+        return out
+    
+    def _apply_chunks(self, x, out, bitgen, chunk_rows):
+        """
+        Yield dropout of x one chunk of rows at a time, written into out.
+        
+        out is either as long as x or a single reusable chunk buffer.
+        """
+        shared = None
+        if self.dims is not None and 0 in self._shared_axes(x.ndim):
+            # Shared across rows, so every chunk must see the same mask
+            shape = self._shared_shape(x.shape)
+            shared = self._mask(bitgen, shape, int(np.prod(shape))) * self._scale
+        
+        full = len(out) == len(x)
+        for start in range(0, len(x), chunk_rows):
+            chunk = x[start:start + chunk_rows]
+            dest = out[start:start + len(chunk)] if full else out[:len(chunk)]
+            if shared is None:
+                yield self._apply(chunk, dest, bitgen)
+            else:
+                yield np.multiply(chunk, shared, out=dest)
+    
+    def _torch_dropout(self, torch, x, inplace, out):
+        """
+        Apply dropout to a torch tensor with torch's Bernoulli sampling.
+        
+        The mask comes from torch's generator, so backward() does not apply
+        (autograd handles the gradient) and dtype is ignored.
+        """
+        # No NumPy mask to replay for this call
+        self._last_state = None
+        if not x.is_floating_point():
+            # Like the NumPy path, integer input yields a float result
+            # (a fresh tensor, so inplace no longer touches the caller's x)
+            x = x.to(torch.get_default_dtype())
+        shape = x.shape if self.dims is None else self._shared_shape(x.shape)
+        mask = x.new_empty(shape).bernoulli_(self._keep_prob)
+        if inplace:
+            result = x.mul_(mask)
+        elif out is not None:
+            result = out.copy_(x).mul_(mask)
+        else:
+            result = x.mul(mask)
+        return result.mul_(self._scale)
+    
+    def _shared_axes(self, ndim):
+        """self.dims as axes in [0, ndim); AxisError if any is out of range."""
+        for d in self.dims:
+            if not -ndim <= d < ndim:
+                raise np.exceptions.AxisError(d, ndim)
+        return [d % ndim for d in self.dims]
+    
+    def _shared_shape(self, shape):
+        """Mask shape with every axis in self.dims collapsed to 1."""
+        shared = self._shared_axes(len(shape))
+        return [1 if d in shared else n for d, n in enumerate(shape)]
+    
+    def _mask(self, bitgen, shape, n):
+        """Draw a keep-mask of the given shape (n elements) from bitgen."""
+        # Each 64-bit Philox output word supplies two uint32 lanes
+        lanes = bitgen.random_raw((n + 1) // 2).view(np.uint32)[:n]
+        return (lanes < self._threshold).reshape(shape)
     
     def train(self):
         """Set to training mode."""
@@ -132,6 +396,18 @@ import sys
 from dropout import VarianceStabilizedDropout
 
 
+def mean_and_var(a):
+    """
+    Mean and variance of all elements in one pass each.
+    
+    Uses E[X^2] - E[X]^2 with a dot product instead of np.var, which
+    allocates a full-size (a - mean) temporary.
+    """
+    flat = a.ravel()
+    mean = flat.mean()
+    return mean, np.dot(flat, flat) / flat.size - mean * mean
+
+
 def test_variance_preservation():
     """
     Test that variance is preserved across different dropout rates.
@@ -151,16 +427,14 @@ def test_variance_preservation():
     for p in dropout_rates:
         # Generate input with known statistics
         input_data = np.random.randn(n_samples, n_features)
-        input_var = np.var(input_data)
-        input_mean = np.mean(input_data)
+        input_mean, input_var = mean_and_var(input_data)
         
         # Apply dropout
         dropout = VarianceStabilizedDropout(dropout_rate=p)
         dropout.train()
         
         output = dropout(input_data)
-        output_var = np.var(output)
-        output_mean = np.mean(output)
+        output_mean, output_var = mean_and_var(output)
         
         # Check variance preservation (key test!)
         var_ratio = output_var / input_var
@@ -334,7 +608,9 @@ def setup_task_files(workspace_dir: Path):
 
 
 # Correct solution for reference
-CORRECT_SOLUTION = '''import numpy as np
+CORRECT_SOLUTION = '''import sys
+
+import numpy as np
 
 
 class VarianceStabilizedDropout:
@@ -345,38 +621,300 @@ class VarianceStabilizedDropout:
     variance rather than just mean.
     """
     
-    def __init__(self, dropout_rate=0.5):
+    # Elements per block when drawing the mask; keeps the mask and raw
+    # random words cache-resident instead of allocating them for all of x
+    _BLOCK_SIZE = 32768
+    
+    # Recorded in place of a generator snapshot when the last forward call
+    # ran in eval mode, so backward() knows it was the identity
+    _IDENTITY = object()
+    
+    def __init__(self, dropout_rate=0.5, dtype=None, seed=None, dims=None):
         """
         Args:
             dropout_rate: Probability of dropping a unit (0 to 1)
+            dtype: Float dtype to compute in (e.g. np.float32 to halve
+                memory traffic); None keeps the input dtype
+            seed: Seed for the mask generator; None draws one from the
+                global NumPy state so np.random.seed() stays reproducible
+            dims: Axis or axes along which one mask is shared (e.g. 0 drops
+                whole features for every sample); None masks each element
         """
         self.dropout_rate = dropout_rate
+        self.dtype = dtype
+        self.dims = (dims,) if np.isscalar(dims) else dims
         self.training = True
+        self._last_state = None
+        self._last_shape = None
+        self._last_chunk_rows = None
+        
+        if seed is None:
+            seed = np.random.randint(2**32, dtype=np.uint32)
+        # Counter-based Philox: a mask can be replayed from a state snapshot
+        self._bitgen = np.random.Philox(seed)
+        
+        # dropout_rate is fixed at construction, so derive these once
+        self._keep_prob = 1.0 - dropout_rate
+        # Keep a unit when a raw uint32 draw falls below this threshold
+        self._threshold = int(self._keep_prob * 2**32)
+        # (float() so the scale does not promote float32 inputs to float64)
+        # FIXED: Use sqrt scaling to preserve variance
+        # Variance = σ² * (1-p) * scale²
+        # For Variance = σ², we need: (1-p) * scale² = 1
+        # Therefore: scale = 1/sqrt(1-p)
+        self._scale = float(1.0 / np.sqrt(self._keep_prob))
     
-    def __call__(self, x):
+    def __call__(self, x, inplace=False, out=None):
         """
         Apply dropout to input array.
         
         Args:
             x: Input array of shape (batch_size, features)
+            inplace: If True, write the result into x instead of a new array
+                (x is only modified if it already has the compute dtype)
+            out: Optional preallocated array of x's shape to write into;
+                reusing one buffer across same-shape calls avoids a fresh
+                allocation per call
             
         Returns:
             Output array with dropout applied (training) or unchanged (eval)
         """
+        # A plain flag check is cheaper than dispatching to a callable
+        # swapped in by eval(), and honours direct writes to .training
         if not self.training:
+            self._last_state = self._IDENTITY
+            self._last_shape = np.shape(x)
             return x
         
-        # Generate dropout mask
-        keep_prob = 1.0 - self.dropout_rate
-        mask = np.random.binomial(1, keep_prob, size=x.shape)
+        # Torch tensors use torch's own (multi-threaded) Bernoulli kernel;
+        # torch is never imported here, only recognised if already loaded
+        torch = sys.modules.get("torch")
+        if torch is not None and isinstance(x, torch.Tensor):
+            return self._torch_dropout(torch, x, inplace, out)
         
-        # FIXED: Use sqrt scaling to preserve variance
-        # Variance = σ² * (1-p) * scale²
-        # For Variance = σ², we need: (1-p) * scale² = 1
-        # Therefore: scale = 1/sqrt(1-p)
-        scale = 1.0 / np.sqrt(keep_prob)
+        if self.dtype is not None:
+            x = np.asarray(x, dtype=self.dtype)
+        
+        dtype = np.result_type(x, self._scale)
+        if inplace and isinstance(x, np.ndarray) and x.dtype == dtype:
+            out = x
+        elif out is None:
+            # Also taken for inplace=True when x cannot hold the scaled
+            # result (e.g. integer input), as documented above
+            out = np.empty_like(x, dtype=dtype)
+        
+        # Remember only the generator state needed to regenerate the
+        # mask in backward()
+        self._last_state = self._bitgen.state
+        self._last_shape = np.shape(x)
+        self._last_chunk_rows = None
+        return self._apply(x, out, self._bitgen)
+    
+    def iter_chunks(self, x, chunk_rows=1024):
+        """
+        Apply dropout to x in chunks of rows, yielding each result.
+        
+        Only one chunk-sized output buffer is allocated, so a consumer can
+        run the next op on each chunk while it is still in cache instead
+        of materialising the full output. A mask shared along axis 0 (see
+        dims) is drawn once and applied to every chunk.
+        
+        backward() afterwards takes the gradient for all of x and replays
+        the same chunk partition; if iteration stops early, only the rows
+        of chunks actually yielded match the forward masks. The pass draws
+        from its own generator, so other forward calls made while the
+        iterator is live do not change its masks.
+        
+        Args:
+            x: Input array of shape (batch_size, features)
+            chunk_rows: Number of rows per chunk
+            
+        Returns:
+            Iterator over the dropout output for each chunk of rows. The
+            buffer is reused, so a chunk is only valid until the next one
+            is requested.
+        """
+        torch = sys.modules.get("torch")
+        if torch is not None and isinstance(x, torch.Tensor):
+            raise TypeError("iter_chunks() supports NumPy arrays only")
+        if chunk_rows < 1:
+            raise ValueError(f"chunk_rows must be at least 1, got {chunk_rows}")
+        if np.ndim(x) == 0:
+            raise ValueError("iter_chunks() needs an array with at least one axis")
+        
+        if not self.training:
+            self._last_state = self._IDENTITY
+            self._last_shape = x.shape
+            return (x[start:start + chunk_rows]
+                    for start in range(0, len(x), chunk_rows))
+        
+        dtype = x.dtype if self.dtype is None else self.dtype
+        buf = np.empty((min(chunk_rows, len(x)),) + x.shape[1:],
+                       dtype=np.result_type(dtype, self._scale))
         
-        return x * mask * scale
+        # One snapshot for the whole pass, taken before any chunk is drawn
+        self._last_state = self._bitgen.state
+        self._last_shape = x.shape
+        self._last_chunk_rows = chunk_rows
+        
+        # Chunks are drawn lazily, so the pass gets a private generator and
+        # the shared one skips every word it could use: each 4-word Philox
+        # block covers at least 8 elements, plus one per block of rows
+        bitgen = np.random.Philox()
+        bitgen.state = self._last_state
+        self._bitgen.advance(x.size // 8 + len(x) + 1)
+        return self._apply_chunks(x, buf, bitgen, chunk_rows)
+    
+    def fused_linear(self, x, W, b):
+        """
+        Compute dropout(x @ W + b) without intermediate arrays.
+        
+        The matmul writes into one preallocated buffer, the bias is added
+        in place and dropout is then applied in place on that buffer, so
+        the linear output is never copied.
+        
+        Args:
+            x: Input array of shape (..., in_features)
+            W: Weight array of shape (in_features, out_features)
+            b: Bias array of shape (out_features,)
+            
+        Returns:
+            Output array of shape (..., out_features)
+        """
+        dtype = self.dtype
+        if dtype is None:
+            dtype = np.result_type(x, W, b, self._scale)
+        y = np.empty(x.shape[:-1] + W.shape[1:], dtype=dtype)
+        np.matmul(x, W, out=y)
+        y += b
+        return self(y, inplace=True)
+    
+    def backward(self, grad):
+        """
+        Propagate a gradient through the last forward call.
+        
+        Follows the mode that call ran in, not the current one: after an
+        eval-mode forward the gradient passes through unchanged.
+        
+        Args:
+            grad: Gradient w.r.t. the output of the last forward call
+            
+        Returns:
+            Gradient w.r.t. the input of that call
+        """
+        if self._last_state is None:
+            raise RuntimeError(
+                "backward() requires a preceding forward call on a NumPy array"
+            )
+        if np.shape(grad) != self._last_shape:
+            raise ValueError(
+                f"grad has shape {np.shape(grad)}, but the last forward call "
+                f"had shape {self._last_shape}"
+            )
+        if self._last_state is self._IDENTITY:
+            return grad
+        
+        # Replay the forward mask bit-for-bit from the saved state
+        bitgen = np.random.Philox()
+        bitgen.state = self._last_state
+        out = np.empty_like(grad, dtype=np.result_type(grad, self._scale))
+        if self._last_chunk_rows is None:
+            return self._apply(grad, out, bitgen)
+        
+        # Forward went through iter_chunks(): replay its chunk partition
+        for _ in self._apply_chunks(grad, out, bitgen, self._last_chunk_rows):
+            pass
+        return out
+    
+    def _apply(self, x, out, bitgen):
+        """Write dropout of x into out, drawing the mask block by block."""
+        if self.dims is not None:
+            # Draw one small mask and broadcast it, so RNG cost scales with
+            # the unshared axes only
+            shape = self._shared_shape(x.shape)
+            mask = self._mask(bitgen, shape, int(np.prod(shape)))
+            return np.multiply(x, mask * self._scale, out=out)
+        
+        if np.ndim(x) == 0:
+            # A scalar is a single block with no rows to split
+            np.multiply(x, self._mask(bitgen, (), 1), out=out)
+            out *= self._scale
+            return out
+        
+        # Bind per-call constants to locals once; the block loop then
+        # avoids repeated attribute and method lookups
+        draw_mask, scale, multiply = self._mask, self._scale, np.multiply
+        rows = max(1, self._BLOCK_SIZE * len(x) // max(1, x.size))
+        for start in range(0, len(x), rows):
+            block = out[start:start + rows]
+            mask = draw_mask(bitgen, block.shape, block.size)
+            # Mask then scale in place: two vectorised ufunc passes over a
+            # cache-resident block, which beats np.where's element-wise select
+            multiply(x[start:start + rows], mask, out=block)
+            block *= scale
+        return out
+    
+    def _apply_chunks(self, x, out, bitgen, chunk_rows):
+        """
+        Yield dropout of x one chunk of rows at a time, written into out.
+        
+        out is either as long as x or a single reusable chunk buffer.
+        """
+        shared = None
+        if self.dims is not None and 0 in self._shared_axes(x.ndim):
+            # Shared across rows, so every chunk must see the same mask
+            shape = self._shared_shape(x.shape)
+            shared = self._mask(bitgen, shape, int(np.prod(shape))) * self._scale
+        
+        full = len(out) == len(x)
+        for start in range(0, len(x), chunk_rows):
+            chunk = x[start:start + chunk_rows]
+            dest = out[start:start + len(chunk)] if full else out[:len(chunk)]
+            if shared is None:
+                yield self._apply(chunk, dest, bitgen)
+            else:
+                yield np.multiply(chunk, shared, out=dest)
+    
+    def _torch_dropout(self, torch, x, inplace, out):
+        """
+        Apply dropout to a torch tensor with torch's Bernoulli sampling.
+        
+        The mask comes from torch's generator, so backward() does not apply
+        (autograd handles the gradient) and dtype is ignored.
+        """
+        # No NumPy mask to replay for this call
+        self._last_state = None
+        if not x.is_floating_point():
+            # Like the NumPy path, integer input yields a float result
+            # (a fresh tensor, so inplace no longer touches the caller's x)
+            x = x.to(torch.get_default_dtype())
+        shape = x.shape if self.dims is None else self._shared_shape(x.shape)
+        mask = x.new_empty(shape).bernoulli_(self._keep_prob)
+        if inplace:
+            result = x.mul_(mask)
+        elif out is not None:
+            result = out.copy_(x).mul_(mask)
+        else:
+            result = x.mul(mask)
+        return result.mul_(self._scale)
+    
+    def _shared_axes(self, ndim):
+        """self.dims as axes in [0, ndim); AxisError if any is out of range."""
+        for d in self.dims:
+            if not -ndim <= d < ndim:
+                raise np.exceptions.AxisError(d, ndim)
+        return [d % ndim for d in self.dims]
+    
+    def _shared_shape(self, shape):
+        """Mask shape with every axis in self.dims collapsed to 1."""
+        shared = self._shared_axes(len(shape))
+        return [1 if d in shared else n for d, n in enumerate(shape)]
+    
+    def _mask(self, bitgen, shape, n):
+        """Draw a keep-mask of the given shape (n elements) from bitgen."""
+        # Each 64-bit Philox output word supplies two uint32 lanes
+        lanes = bitgen.random_raw((n + 1) // 2).view(np.uint32)[:n]
+        return (lanes < self._threshold).reshape(shape)
     
     def train(self):
         """Set to training mode."""